@@ -17,7 +17,56 @@ __status__ = "In Development"
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
+from urllib3.util.retry import Retry
+
+# orjson parses large payloads several times faster than the standard
+# library; fall back to the standard library when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Retry transient failures (rate limiting and server hiccups) with
+# exponential backoff so one blip does not fail a whole run
+# Retry-After headers from the server are honoured automatically and
+# non-idempotent POSTs are not retried
+_retries = Retry(total=5, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+
+# One session shared by every API call
+# Keep-alive connections are pooled and reused, so only the first call to
+# the PCE pays the TCP and TLS handshake
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=50, max_retries=_retries))
+
+
+# Parse the JSON body of a response
+# The workload and label lists can run to thousands of items,
+# so use orjson when it is available
+def load_json(response):
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+# Headers never change between calls, so build them once
+_SYNC_HEADERS = {"Content-Type": "application/json", "Accept": "application/json"}
+# IMPORTANT: "Prefer": "respond-async" on header for the asynchronous call
+_ASYNC_HEADERS = {"Prefer": "respond-async", "Content-type": "application/json", "Accept": "application/json"}
+
+# Set connection timeout (avoid hanging, usually when user insert the wrong port number)
+_TIMEOUT = 15
+
+
+# Reuse one HTTPBasicAuth object per credential instead of building a
+# fresh one on every call
+def _basic_auth(creds):
+    auth = getattr(creds, "_basic_auth", None)
+    if auth is None:
+        auth = HTTPBasicAuth(creds.username, creds.auth_secret)
+        creds._basic_auth = auth
+    return auth
 
 
 # Making a synchronous API call
@@ -32,14 +81,9 @@ def sync_api(creds, http_verb, resource, has_org, payload=None):
     else:
         api_url = creds.url_with_api(resource)
 
-    # Declare headers
-    headers = {"Content-Type": "application/json", "Accept": "application/json"}
-    # Set connection timeout (avoid hanging, usually when user insert the wrong port number)
-    timeout = 15
-
     # Make the call
-    response = requests.request(http_verb, api_url, auth=HTTPBasicAuth(creds.username, creds.auth_secret),
-                                headers=headers, timeout=timeout, data=json.dumps(payload))
+    response = _session.request(http_verb, api_url, auth=_basic_auth(creds),
+                                headers=_SYNC_HEADERS, timeout=_TIMEOUT, json=payload)
 
     return response
 
@@ -58,15 +102,9 @@ def async_api(creds, resource, has_org, payload=None):
     else:
         api_url = creds.url_with_api(resource)
 
-    # Declare headers
-    # IMPORTANT: "Prefer": "respond-async" on header
-    headers = {"Prefer": "respond-async", "Content-type": "application/json", "Accept": "application/json"}
-    # Set connection timeout (avoid hanging, usually when user insert the wrong port number)
-    timeout = 15
-
     # Make the call
-    response = requests.request("get", api_url, auth=HTTPBasicAuth(creds.username, creds.auth_secret),
-                                headers=headers, timeout=timeout, data=json.dumps(payload))
+    response = _session.request("get", api_url, auth=_basic_auth(creds),
+                                headers=_ASYNC_HEADERS, timeout=_TIMEOUT, json=payload)
 
     # Since this is an asynchronous call so instead of the result,
     # The server will send back a special URL; We will perform GET operation on that URL
@@ -80,13 +118,13 @@ def async_api(creds, resource, has_org, payload=None):
     monitor_url = response.headers['Location']
     while status != "done" and status != "failed":
         response = sync_api(creds, "get", monitor_url, False)
-        status = json.loads(response.content)['status']
+        status = load_json(response)['status']
         time.sleep(1)
 
     # After the status on the second URL become "done"
     # The server will send us a third URL
     # Use the HREF to get results of the request
-    response = sync_api(creds, "get", json.loads(response.content)['result']['href'], False)
+    response = sync_api(creds, "get", load_json(response)['result']['href'], False)
 
     return response
 
@@ -3,6 +3,8 @@
 """
 Operations with labels:
 - Create labels
+- Create a label and return its href
+- Create several labels concurrently
 - Get a particular label
 - Get labels
 - Update a label's value (name)
@@ -19,8 +21,38 @@ __email__ = "davidnguyen0207@gmail.com"
 __status__ = "In Development"
 
 # Import required modules
-from ansible_collections.respiro.illumio.plugins.module_utils.api_calls import sync_api, async_api
+from ansible_collections.respiro.illumio.plugins.module_utils.api_calls import sync_api, async_api, load_json
+from concurrent.futures import ThreadPoolExecutor
 import json
+import os
+import time
+
+# On-disk cache for the label href dictionary, one file per PCE and org
+# The label set rarely changes between consecutive module runs, so a
+# short-lived cache saves a full label fetch on every invocation
+_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "respiro_illumio")
+# How long a cached label dictionary stays valid, in seconds
+_CACHE_TTL = 60
+
+
+# Path of the cache file for a given credential
+def _cache_path(creds):
+    # org_href looks like /orgs/<id>; keep the file name filesystem safe
+    org = creds.org_href.strip("/").replace("/", "_")
+    return os.path.join(_CACHE_DIR, "labels." + creds.pce + "." + org + ".json")
+
+
+# Write a label dictionary back to the on-disk cache
+# Modules that create labels should call this with their updated
+# dictionary so a rerun within the cache TTL sees the new labels
+# Best effort like every other cache operation
+def save_label_href_dict(creds, labels):
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        with open(_cache_path(creds), 'w') as cached:
+            json.dump(labels, cached)
+    except OSError:
+        pass
 
 
 # Create new label
@@ -29,6 +61,31 @@ def create_label(creds, type, name):
     return sync_api(creds, "post", "/labels", True, {"key": type, "value": name})
 
 
+# Create new label and return the href of the created label
+# Required a credential, a label's type and label's name
+# Use this instead of create_label when only the href is needed,
+# so callers don't have to parse the response body themselves
+def create_label_href(creds, type, name):
+    response = create_label(creds, type, name)
+    if response.status_code == 201:
+        return load_json(response)['href']
+    # The PCE refused the create, most likely because the label already
+    # exists (e.g. it was created by another run after our cached label
+    # dictionary was written); the error body is a JSON array with no
+    # href, so fetch the authoritative list and look the label up there
+    return create_label_href_dict(creds, use_cache=False)[type][name]
+
+
+# Create several labels at once
+# Required credential and a list of (type, name) pairs
+# Each POST is an independent HTTPS round-trip, so the calls are fanned
+# out over a thread pool instead of being made one after another
+# Returns the responses in the same order as the input list
+def create_labels(creds, pairs, max_workers=10):
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(lambda pair: create_label(creds, pair[0], pair[1]), pairs))
+
+
 # Get a particular label
 # Require the href of the label and credential
 def get_label(creds, label_href):
@@ -41,7 +98,8 @@ def get_label(creds, label_href):
 # Will use async request if the data set has >500 items
 def get_labels(creds):
     response = sync_api(creds, "get", "/labels?max_result=1", True)
-    num_items_in_return_set = int(response.headers['X-Total-Count'])
+    # Default to 0 when the header is missing (e.g. error responses)
+    num_items_in_return_set = int(response.headers.get('X-Total-Count', 0))
     if num_items_in_return_set >= 500:
         response = async_api(creds, "/labels", True)
     return response
@@ -58,21 +116,31 @@ def update_label(creds, label_href, payload):
 # The dict will contain 4 keys corresponded with 4 label's types (role, app, env, loc)
 # The value inside each key is another dict contains all the existing labels of that type
 # Inside the inner dict, the key is the label's name and value is label's href
-def create_label_href_dict(creds):
+# The result is cached on disk for a short time so back to back module
+# runs skip the label fetch; pass use_cache=False to always fetch
+def create_label_href_dict(creds, use_cache=True):
+    cache_file = _cache_path(creds)
+    if use_cache:
+        try:
+            if time.time() - os.path.getmtime(cache_file) < _CACHE_TTL:
+                with open(cache_file, 'r') as cached:
+                    return json.load(cached)
+        except (OSError, ValueError):
+            # Missing, unreadable or corrupt cache; fall through and fetch
+            pass
     response = get_labels(creds)
-    labels_list = json.loads(response.content)
+    labels_list = load_json(response)
     labels = dict()
     labels['role'] = dict()
     labels['app'] = dict()
     labels['env'] = dict()
     labels['loc'] = dict()
     for label in labels_list:
-        if label['key'] == "role":
-            labels['role'][label['value']] = label['href']
-        if label['key'] == "app":
-            labels['app'][label['value']] = label['href']
-        if label['key'] == "env":
-            labels['env'][label['value']] = label['href']
-        if label['key'] == "loc":
-            labels['loc'][label['value']] = label['href']
+        # One lookup on the label's key instead of four equality checks;
+        # unknown kinds are simply skipped
+        kind = labels.get(label['key'])
+        if kind is not None:
+            kind[label['value']] = label['href']
+    if use_cache:
+        save_label_href_dict(creds, labels)
     return labels
@@ -4,6 +4,7 @@
 Operations with workloads:
 - Get workloads
 - Update a workload's details
+- Update several workloads' details in one bulk request
 - Create unmanaged workload
 """
 
@@ -24,7 +25,8 @@ from ansible_collections.respiro.illumio.plugins.module_utils.api_calls import s
 # Required credential
 def get_workloads(creds):
     response = sync_api(creds, "get", "/workloads?max_result=1", True)
-    num_items_in_return_set = int(response.headers['X-Total-Count'])
+    # Default to 0 when the header is missing (e.g. error responses)
+    num_items_in_return_set = int(response.headers.get('X-Total-Count', 0))
     if num_items_in_return_set >= 500:
         response = async_api(creds, "/workloads", True)
     return response
@@ -37,6 +39,14 @@ def update_workload(creds, workload_href, payload):
     return sync_api(creds, "put", workload_href, False, payload)
 
 
+# Update several workloads in one request via the PCE bulk update endpoint
+# Required credential and a list of workload objects, each carrying the
+# workload's href plus the fields to change
+# The response body holds a per-workload status list
+def bulk_update_workloads(creds, updates):
+    return sync_api(creds, "put", "/workloads/bulk_update", True, updates)
+
+
 # Create unmanaged workload
 # Required a credential, name (display on PCE)
 # A hostname, an IP
@@ -71,12 +71,13 @@ original_message:
 from ansible.module_utils.basic import AnsibleModule
 import time
 import csv
-import json
 
 # Import helper modules
+from ansible_collections.respiro.illumio.plugins.module_utils.api_calls import load_json
 from ansible_collections.respiro.illumio.plugins.module_utils.credential import Credential
-from ansible_collections.respiro.illumio.plugins.module_utils.labels import create_label, create_label_href_dict
-from ansible_collections.respiro.illumio.plugins.module_utils.workloads import get_workloads, update_workload
+from ansible_collections.respiro.illumio.plugins.module_utils.labels import create_labels, create_label_href_dict, \
+    save_label_href_dict
+from ansible_collections.respiro.illumio.plugins.module_utils.workloads import get_workloads, bulk_update_workloads
 
 
 def run_module():
@@ -107,82 +108,126 @@ def run_module():
 
     # Main code: Checks csv file and compares labels in pce and labels in csv file, and assign labels to worloads
     labels_details = create_label_href_dict(cred)
+
+    # Get workloads from the PCE once; the list does not change between csv rows
+    # so there is no need to refetch it on every row
+    response = get_workloads(cred)
+    workloads_list = load_json(response)
+
+    # Index the workloads by hostname so each csv row is a single dict
+    # lookup instead of a scan over the whole workload list
+    workload_index = dict()
+    for workload_data in workloads_list:
+        workload_index[workload_data['hostname']] = workload_data
+
     # getting data from the csv file and do the required operations
-    with open(workload, 'r') as details:
-        workload_details = csv.DictReader(details, delimiter=",")
+    # A large read buffer keeps the syscall count down on big csv files
+    updates = []
+    hostname_by_href = {}
+    with open(workload, 'r', newline='', buffering=1 << 20) as details:
+        workload_details = csv.reader(details, delimiter=",")
+        # Read the header once and map column names to positions so each
+        # row can stay a plain list instead of a per-row dict
+        header = next(workload_details)
+        column = {name: position for position, name in enumerate(header)}
+
+        # Hoist the column positions into locals so each row access is a
+        # plain list index instead of a dict lookup
+        hostname_column = column['hostname']
+        label_columns = [(kind, column[kind]) for kind in ('role', 'app', 'env', 'loc')]
+
+        # First pass: collect every label value the csv refers to so the
+        # missing ones can be created before the assignment loop starts
+        needed = {'role': set(), 'app': set(), 'env': set(), 'loc': set()}
         for rows in workload_details:
-            hostname = rows["hostname"]
-            role = rows['role']
-            app = rows['app']
-            env = rows['env']
-            loc = rows['loc']
-
-            # Get workloads from the PCE
-            response = get_workloads(cred)
-            workloads_list = json.loads(response.text)
-
-            # Check if label already exists in PCE. If not add to PCE and get its href.
-            if role != "":
-                if role in labels_details['role']:
-                    role_href = labels_details['role'][role]
-                else:
-                    href = json.loads(create_label(cred, "role", role).content)['href']
-                    labels_details['role'][role] = href
-                    role_href = href
-            else:
-                role_href = ""
-            if app != "":
-                if app in labels_details['app']:
-                    app_href = labels_details['app'][app]
-                else:
-                    href = json.loads(create_label(cred, "app", app).content)['href']
-                    labels_details['app'][app] = href
-                    app_href = href
-            else:
-                app_href = ""
-            if env != "":
-                if env in labels_details['env']:
-                    env_href = labels_details['env'][env]
-                else:
-                    href = json.loads(create_label(cred, "env", env).content)['href']
-                    labels_details['env'][env] = href
-                    env_href = href
-            else:
-                env_href = ""
-            if loc != "":
-                if loc in labels_details['loc']:
-                    loc_href = labels_details['loc'][loc]
-                else:
-                    href = json.loads(create_label(cred, "loc", loc).content)['href']
-                    labels_details['loc'][loc] = href
-                    loc_href = href
-            else:
-                loc_href = ""
-
-            # Wait for the PCE to finish creating the new labels
-            # This is just a fail-safe
-            # Might not be necessary
+            # Skip blank lines, which DictReader used to swallow silently
+            if not rows:
+                continue
+            for kind, position in label_columns:
+                value = rows[position]
+                if value != "":
+                    needed[kind].add(value)
+
+        # Create the labels that are not on the PCE yet as one concurrent
+        # batch and record the hrefs from the responses
+        missing = []
+        for kind in ('role', 'app', 'env', 'loc'):
+            for value in needed[kind] - set(labels_details[kind]):
+                missing.append((kind, value))
+        created = 0
+        if missing:
+            responses = create_labels(cred, missing)
+            for (kind, value), response in zip(missing, responses):
+                if response.status_code == 201:
+                    labels_details[kind][value] = load_json(response)['href']
+                    created += 1
+            # A refused create usually means the label appeared on the PCE
+            # after our label dictionary was built, e.g. made by another
+            # run; refresh the dictionary to pick those hrefs up
+            if created != len(missing):
+                for kind, fresh in create_label_href_dict(cred, use_cache=False).items():
+                    labels_details[kind].update(fresh)
+            # Keep the on-disk cache in step with the labels just created
+            # so a rerun within the cache TTL sees them
+            save_label_href_dict(cred, labels_details)
+
+        # Wait for the PCE to finish creating the new labels
+        # This is just a fail-safe
+        # Might not be necessary
+        if created:
             time.sleep(4.0)
 
+        # Second pass: rewind and stream the file again instead of keeping
+        # every row in memory; all label hrefs are now in labels_details,
+        # so each row only does dict lookups
+        details.seek(0)
+        next(workload_details)
+        for rows in workload_details:
+            # Skip blank lines, which DictReader used to swallow silently
+            if not rows:
+                continue
+            hostname = rows[hostname_column]
+
+            # Resolve the href for whichever label kinds the row fills in
+            # The list is rebuilt per row, so an empty field can never pick
+            # up a href left over from an earlier row
+            label = []
+            for kind, position in label_columns:
+                value = rows[position]
+                if value != "":
+                    label.append({"href": labels_details[kind][value]})
+
             # check the workload from PCE with workload from csv file and assign labels
-            check = 0
-            for workload in workloads_list:
-                if workload['hostname'] == hostname:
-                    check = 1
-                    label = []
-                    if role_href:
-                        label.append({"href": role_href})
-                    if app_href:
-                        label.append({"href": app_href})
-                    if env_href:
-                        label.append({"href": env_href})
-                    if loc_href:
-                        label.append({"href": loc_href})
-                    update_workload(cred, workload['href'], {'labels': label})
-                    list['assigned'].append(hostname)
-            if check == 0:
+            workload_data = workload_index.get(hostname)
+            if workload_data is not None:
+                updates.append({'href': workload_data['href'], 'labels': label})
+                hostname_by_href[workload_data['href']] = hostname
+            else:
+                list['not_assigned'].append(hostname)
+
+    # Push the collected updates to the PCE through bulk_update instead of
+    # one PUT per matched row, and sort the hostnames into assigned or
+    # not_assigned from the per-workload statuses in the reply
+    # The PCE caps bulk operations at 1000 workloads per request, so send
+    # the updates in batches of that size
+    for start in range(0, len(updates), 1000):
+        batch = updates[start:start + 1000]
+        response = bulk_update_workloads(cred, batch)
+        if response.status_code != 200:
+            # The PCE rejected the batch outright; none of its workloads
+            # were updated and the error body carries no hrefs
+            for entry in batch:
+                list['not_assigned'].append(hostname_by_href[entry['href']])
+            continue
+        for entry in load_json(response):
+            hostname = hostname_by_href.get(entry.get('href'))
+            if hostname is None:
+                continue
+            if entry.get('status') == 'updated':
+                list['assigned'].append(hostname)
+            else:
                 list['not_assigned'].append(hostname)
-        module.exit_json(changed=True, labels_assigned=list['assigned'], not_assigned=list['not_assigned'])
+    module.exit_json(changed=True, labels_assigned=list['assigned'], not_assigned=list['not_assigned'])
 
 
 def main():
@@ -104,10 +104,13 @@ import csv
 
 # Import helper modules
 from ansible_collections.respiro.illumio.plugins.module_utils.credential import Credential
-from ansible_collections.respiro.illumio.plugins.module_utils.labels import create_label
+from ansible_collections.respiro.illumio.plugins.module_utils.labels import create_label, create_labels
 
 
 def run_module():
+    # Label types accepted by the PCE
+    VALID_TYPES = frozenset(('loc', 'env', 'role', 'app'))
+
     # define available arguments/parameters a user can pass to the module
     module_args = dict(
         name=dict(type='str', required=False),
@@ -139,18 +142,40 @@ def run_module():
     list = {"success": [], "error": []}
     try:
         if l_path:
-            with open(l_path, 'r') as data_file:
-                label_value = csv.DictReader(data_file, delimiter=",")
+            valid = []
+            # A large read buffer keeps the syscall count down on big csv files
+            with open(l_path, 'r', newline='', buffering=1 << 20) as data_file:
+                label_value = csv.reader(data_file, delimiter=",")
+                # Read the header once and map column names to positions so
+                # each row can stay a plain list instead of a per-row dict
+                header = next(label_value)
+                column = {name: position for position, name in enumerate(header)}
+                # Hoist the column positions into locals so each row access
+                # is a plain list index instead of a dict lookup
+                type_column = column['type']
+                name_column = column['name']
                 for rows in label_value:
-                    key = rows["type"]
-                    value = rows["name"]
-                    if key == 'loc' or key == 'env' or key == 'role' or key == 'app':
-                        response = create_label(cred, key, value)
-                        list["success"].append(key + " : " + value)
+                    # Skip blank lines, which DictReader used to swallow silently
+                    if not rows:
+                        continue
+                    key = rows[type_column]
+                    value = rows[name_column]
+                    if key in VALID_TYPES:
+                        valid.append((key, value))
                     else:
                         list["error"].append("Invalid type:" + key + ". Type should be either env,app,loc,role")
+
+            # POST the valid labels concurrently, one POST per row done in
+            # sequence would make the run time scale with round-trip latency
+            # Report success or failure from the actual response status
+            responses = create_labels(cred, valid)
+            for (key, value), response in zip(valid, responses):
+                if response.status_code == 201:
+                    list["success"].append(key + " : " + value)
+                else:
+                    list["error"].append(key + " : " + value + " (HTTP " + str(response.status_code) + ")")
         elif l_type and l_name:
-            if l_type == 'env' or l_type == 'loc' or l_type == 'app' or l_type == 'role':
+            if l_type in VALID_TYPES:
                 y = {"key": l_type, "value": l_name}
                 list["success"].append(l_type + " : " + l_name)
                 response = create_label(cred, l_type, l_name)
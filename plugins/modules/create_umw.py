@@ -68,12 +68,12 @@ sample:
 
 from ansible.module_utils.basic import AnsibleModule
 import time
-import json
 import csv
 
 # Import helper modules
 from ansible_collections.respiro.illumio.plugins.module_utils.credential import Credential
-from ansible_collections.respiro.illumio.plugins.module_utils.labels import create_label, create_label_href_dict
+from ansible_collections.respiro.illumio.plugins.module_utils.labels import create_label_href, create_label_href_dict, \
+    save_label_href_dict
 from ansible_collections.respiro.illumio.plugins.module_utils.workloads import create_umw
 
 
@@ -98,6 +98,7 @@ def run_module():
 
     cred = Credential(login, auth_secret, pce, org_href)
     labels_details = create_label_href_dict(cred)
+    new_labels = False
     with open(workload, 'r') as details:
         workload_details = csv.DictReader(details, delimiter=",")
         for rows in workload_details:
@@ -108,42 +109,36 @@ def run_module():
             app = rows["app"]
             env = rows["env"]
             loc = rows["loc"]
-            if role is not "":
-                if role in labels_details['role']:
-                    role = labels_details['role'][role]
-                else:
-                    href = json.loads(create_label(cred, "role", role).content)['href']
+            # Look each label up with a single get instead of an "in" check
+            # followed by a second lookup; create the label if it is missing
+            if role != "":
+                href = labels_details['role'].get(role)
+                if href is None:
+                    href = create_label_href(cred, "role", role)
                     labels_details['role'][role] = href
-                    role = href
-            else:
-                role = ""
-            if app is not "":
-                if app in labels_details['app']:
-                    app = labels_details['app'][app]
-                else:
-                    href = json.loads(create_label(cred, "app", app).content)['href']
+                    new_labels = True
+                role = href
+            if app != "":
+                href = labels_details['app'].get(app)
+                if href is None:
+                    href = create_label_href(cred, "app", app)
                     labels_details['app'][app] = href
-                    app = href
-            else:
-                app = ""
-            if env is not "":
-                if env in labels_details['env']:
-                    env = labels_details['env'][env]
-                else:
-                    href = json.loads(create_label(cred, "env", env).content)['href']
+                    new_labels = True
+                app = href
+            if env != "":
+                href = labels_details['env'].get(env)
+                if href is None:
+                    href = create_label_href(cred, "env", env)
                     labels_details['env'][env] = href
-                    env = href
-            else:
-                env = ""
-            if loc is not "":
-                if loc in labels_details['loc']:
-                    loc = labels_details['loc'][loc]
-                else:
-                    href = json.loads(create_label(cred, "loc", loc).content)['href']
+                    new_labels = True
+                env = href
+            if loc != "":
+                href = labels_details['loc'].get(loc)
+                if href is None:
+                    href = create_label_href(cred, "loc", loc)
                     labels_details['loc'][loc] = href
-                    loc = href
-            else:
-                loc = ""
+                    new_labels = True
+                loc = href
 
             # Wait for the PCE to finish creating the new labels
             # This is just a fail-safe
@@ -151,6 +146,11 @@ def run_module():
             time.sleep(4.0)
 
             create_umw(cred, name, hostname, ip, role, app, env, loc)
+
+    # Keep the on-disk cache in step with the labels created during the
+    # run so a rerun within the cache TTL sees them
+    if new_labels:
+        save_label_href_dict(cred, labels_details)
     module.exit_json(changed=True, meta='Workload added')
 
 
@@ -83,9 +83,9 @@ sample:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-import json
 
 # Import helper modules
+from ansible_collections.respiro.illumio.plugins.module_utils.api_calls import load_json
 from ansible_collections.respiro.illumio.plugins.module_utils.credential import Credential
 from ansible_collections.respiro.illumio.plugins.module_utils.labels import get_labels
 
@@ -127,7 +127,7 @@ def run_module():
 
     try:
         response = get_labels(cred)
-        obj = json.loads(response.text)
+        obj = load_json(response)
         list = []
         for values in obj:
             if values['key'] == input_type:
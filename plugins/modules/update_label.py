@@ -113,10 +113,10 @@ success:
 '''
 
 from ansible.module_utils.basic import AnsibleModule
-import json
 from requests.exceptions import ConnectionError, Timeout
 
 # Import helper modules
+from ansible_collections.respiro.illumio.plugins.module_utils.api_calls import load_json
 from ansible_collections.respiro.illumio.plugins.module_utils.credential import Credential
 from ansible_collections.respiro.illumio.plugins.module_utils.labels import get_label, update_label
 
@@ -169,7 +169,7 @@ def run_module():
         # If yes then exit
         # If no then update
         if response_get.status_code == 200:
-            current_value = json.loads(response_get.content)['value']
+            current_value = load_json(response_get)['value']
             if current_value == new_value:
                 module.exit_json(ok="Current label's name is already the same as input value. "
                                     "Additional change is not required.", **result)